@@ -1,11 +1,19 @@
+import functools
 import os
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
 from typing import Optional, Dict
 
 
+@functools.lru_cache(maxsize=1)
 def get_llm():
-    """Initializes and returns the ChatGroq LLM instance."""
+    """
+    Initializes and returns the ChatGroq LLM instance.
+
+    The instance is cached so every call shares one client (and its
+    underlying pooled HTTP connections) instead of paying a fresh TLS
+    handshake per call.
+    """
     api_key = os.getenv("GROQ_API_KEY")
     
     if not api_key:
@@ -18,6 +26,12 @@ def get_llm():
         api_key=api_key
     )
 
+@functools.lru_cache(maxsize=32)
+def _compiled_chain(prompt_template: str):
+    """Builds the prompt | llm chain once per template and reuses it."""
+    prompt = ChatPromptTemplate.from_template(prompt_template)
+    return prompt | get_llm()
+
 def call_ai(prompt_template: str, context: Dict) -> Optional[str]:
     """
     Calls the configured LLM with a given prompt template and context.
@@ -31,11 +45,8 @@ def call_ai(prompt_template: str, context: Dict) -> Optional[str]:
         The string response from the AI, or None if an error occurs.
     """
     try:
-        llm = get_llm()
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        
-        chain = prompt | llm
-        
+        chain = _compiled_chain(prompt_template)
+
         response = chain.invoke(context)
         
         return response.content
@@ -1,7 +1,23 @@
+import asyncio
+import hashlib
+import json
+import os
 import re
-from typing import Optional, Dict
+import time
+from typing import Dict, List, Optional
 from cqia_agent.analysis.models import Issue
 from cqia_agent.ai.caller import call_ai
+from cqia_agent.utils.fastjson import json_loads
+
+# Cap on how many enrichment requests are in flight at once, so throughput is
+# bounded by the API rate limit rather than sequential round-trip latency.
+MAX_CONCURRENT_ENRICHMENTS = 10
+ENRICHMENT_RETRY_ATTEMPTS = 3
+
+ENRICHMENT_CACHE_DIR = os.path.join(os.getcwd(), '.cqia_cache', 'enrich')
+
+# In-process cache for the current run; the on-disk cache persists across runs.
+_enrichment_cache: Dict[str, Dict[str, Optional[str]]] = {}
 
 ENRICHMENT_PROMPT_TEMPLATE = """
 You are an expert code reviewer. A static analysis tool has found the following issue:
@@ -22,17 +38,49 @@ Other than that remove any extra special asteriks (*)
 Do not have duplicates in content
 """
 
-def _extract_code_context(file_content: str, line_number: int, context_lines: int = 5) -> str:
-    lines = file_content.splitlines()
+BATCH_ENRICHMENT_PROMPT_TEMPLATE = """
+You are an expert code reviewer. A static analysis tool has found the issues listed below, all in the file {file_path}.
+
+{issues_block}
+
+Your task is to enrich every finding. Return ONLY a JSON object with a single key "enrichments" whose value is an array with one object per issue, shaped as {{"id": <issue id>, "explanation": "...", "suggestion": "..."}}.
+- "explanation": in a friendly and educational tone, explain *why* this is an issue.
+- "suggestion": a clear, actionable suggestion for how to fix the issue.
+Do not include any text outside the JSON object.
+"""
+
+def compute_line_starts(file_content: str) -> List[int]:
+    """Builds the offset of each line start, so snippets can slice in O(1)."""
+    starts = [0]
+    find = file_content.find
+    i = find('\n')
+    while i != -1:
+        starts.append(i + 1)
+        i = find('\n', i + 1)
+    return starts
+
+def extract_code_context(file_content: str, line_number: int, context_lines: int = 5,
+                         line_starts: Optional[List[int]] = None) -> str:
+    if line_starts is None:
+        line_starts = compute_line_starts(file_content)
+    total_lines = len(line_starts)
     start = max(0, line_number - context_lines - 1)
-    end = min(len(lines), line_number + context_lines)
-    snippet_lines = lines[start:end]
+    end = min(total_lines, line_number + context_lines)
+    if start >= total_lines:
+        return ""
+    slice_end = line_starts[end] if end < total_lines else len(file_content)
+    snippet_lines = file_content[line_starts[start]:slice_end].splitlines()
     return "\n".join(f"{i+1:4d}| {line}" for i, line in enumerate(snippet_lines, start=start))
 
+# Lowercased response-section markers; matched with str.find, which is O(n)
+# and cannot backtrack the way a mis-escaped [EXPLANATION] regex class would.
+_EXPLANATION_MARKER = "[explanation]"
+_SUGGESTION_MARKER = "[suggestion]"
+
 def _parse_ai_response(response: str) -> tuple[Optional[str], Optional[str]]:
     """A more robust parser for the AI's response."""
-    exp_marker = "[explanation]"
-    sug_marker = "[suggestion]"
+    exp_marker = _EXPLANATION_MARKER
+    sug_marker = _SUGGESTION_MARKER
     response_lower = response.lower()
     
     exp_start = response_lower.find(exp_marker)
@@ -58,12 +106,169 @@ def _parse_ai_response(response: str) -> tuple[Optional[str], Optional[str]]:
 
     return explanation, suggestion
 
-def enrich_issue(issue: Issue, file_content_str: str) -> Issue:
-    code_snippet = _extract_code_context(file_content_str, issue.line_number)
+def _enrichment_cache_key(issue: Issue, code_snippet: str) -> str:
+    """Content-addressed key; includes the model name so a model switch invalidates."""
+    model_name = os.getenv("GROQ_MODEL_NAME", "openai/gpt-oss-20b")
+    raw = f"{model_name}|{issue.code}|{issue.message}|{code_snippet}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def _load_cached_enrichment(key: str) -> Optional[Dict[str, Optional[str]]]:
+    if key in _enrichment_cache:
+        return _enrichment_cache[key]
+    cache_path = os.path.join(ENRICHMENT_CACHE_DIR, f"{key}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    _enrichment_cache[key] = entry
+    return entry
+
+def _store_cached_enrichment(key: str, explanation: Optional[str], suggestion: Optional[str]):
+    entry = {"explanation": explanation, "suggestion": suggestion}
+    _enrichment_cache[key] = entry
+    try:
+        os.makedirs(ENRICHMENT_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(ENRICHMENT_CACHE_DIR, f"{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+    except OSError:
+        pass  # The cache is best-effort; enrichment still succeeded.
+
+def enrich_issue(issue: Issue, file_content_str: Optional[str] = None) -> Issue:
+    if issue.code_snippet is not None:
+        code_snippet = issue.code_snippet
+    else:
+        code_snippet = extract_code_context(file_content_str or "", issue.line_number)
+
+    cache_key = _enrichment_cache_key(issue, code_snippet)
+    cached = _load_cached_enrichment(cache_key)
+    if cached is not None:
+        issue.ai_explanation = cached.get("explanation")
+        issue.ai_suggestion = cached.get("suggestion")
+        return issue
+
     context = { "issue_code": issue.code, "file_path": issue.file_path, "line_number": issue.line_number, "issue_message": issue.message, "code_snippet": code_snippet }
     ai_response = call_ai(ENRICHMENT_PROMPT_TEMPLATE, context)
     if ai_response:
         explanation, suggestion = _parse_ai_response(ai_response)
         issue.ai_explanation = explanation
         issue.ai_suggestion = suggestion
-    return issue
\ No newline at end of file
+        _store_cached_enrichment(cache_key, explanation, suggestion)
+    return issue
+
+def _call_ai_with_retry(prompt_template: str, context: Dict) -> Optional[str]:
+    """
+    Calls the LLM with exponential backoff: call_ai returns None on
+    rate-limit/timeout errors, so retry a few times before giving up.
+    """
+    for attempt in range(ENRICHMENT_RETRY_ATTEMPTS):
+        response = call_ai(prompt_template, context)
+        if response:
+            return response
+        if attempt < ENRICHMENT_RETRY_ATTEMPTS - 1:
+            time.sleep(2 ** attempt)
+    return None
+
+def _format_issues_block(issues: List[Issue]) -> str:
+    """Formats a file's issues as numbered entries for the batch prompt."""
+    parts = []
+    for issue_id, issue in enumerate(issues):
+        parts.append(
+            f"Issue {issue_id}:\n"
+            f"- Issue Type: {issue.code}\n"
+            f"- Line: {issue.line_number}\n"
+            f"- Original Message: {issue.message}\n"
+            f"- Code Snippet:\n{issue.code_snippet or ''}"
+        )
+    return "\n\n".join(parts)
+
+def _parse_batch_response(response: str) -> Dict[int, Dict[str, Optional[str]]]:
+    """Parses the batch JSON response into a mapping of issue id -> enrichment."""
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.strip('`')
+        if text.startswith("json"):
+            text = text[4:]
+    data = json_loads(text)
+    entries = data.get("enrichments", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        # Valid JSON but not the shape we asked for (e.g. a bare scalar);
+        # treat it like malformed output so the caller's fallback runs.
+        raise ValueError("batch enrichment response is not a list of entries")
+    parsed = {}
+    for entry in entries:
+        try:
+            parsed[int(entry["id"])] = {
+                "explanation": entry.get("explanation"),
+                "suggestion": entry.get("suggestion"),
+            }
+        except (KeyError, TypeError, ValueError):
+            continue
+    return parsed
+
+def enrich_file_issues(file_path: str, issues: List[Issue]) -> List[Issue]:
+    """
+    Enriches all of one file's issues with a single batched LLM request,
+    paying the prompt preamble once instead of once per issue.
+    """
+    pending = []
+    pending_keys = []
+    for issue in issues:
+        cache_key = _enrichment_cache_key(issue, issue.code_snippet or "")
+        cached = _load_cached_enrichment(cache_key)
+        if cached is not None:
+            issue.ai_explanation = cached.get("explanation")
+            issue.ai_suggestion = cached.get("suggestion")
+        else:
+            pending.append(issue)
+            pending_keys.append(cache_key)
+
+    if not pending:
+        return issues
+
+    context = {"file_path": file_path, "issues_block": _format_issues_block(pending)}
+    ai_response = _call_ai_with_retry(BATCH_ENRICHMENT_PROMPT_TEMPLATE, context)
+    if not ai_response:
+        return issues
+
+    try:
+        enrichments = _parse_batch_response(ai_response)
+    except (json.JSONDecodeError, ValueError):
+        # Malformed batch output: fall back to the per-issue marker protocol.
+        for issue in pending:
+            enrich_issue(issue)
+        return issues
+
+    for issue_id, (issue, cache_key) in enumerate(zip(pending, pending_keys)):
+        entry = enrichments.get(issue_id)
+        if entry is None:
+            continue
+        issue.ai_explanation = entry.get("explanation")
+        issue.ai_suggestion = entry.get("suggestion")
+        _store_cached_enrichment(cache_key, issue.ai_explanation, issue.ai_suggestion)
+    return issues
+
+async def _enrich_all(issues: List[Issue]) -> List[Issue]:
+    issues_by_file: Dict[str, List[Issue]] = {}
+    for issue in issues:
+        issues_by_file.setdefault(issue.file_path, []).append(issue)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ENRICHMENTS)
+
+    async def _bounded(file_path: str, file_issues: List[Issue]):
+        async with semaphore:
+            await asyncio.to_thread(enrich_file_issues, file_path, file_issues)
+
+    await asyncio.gather(*[
+        _bounded(file_path, file_issues)
+        for file_path, file_issues in issues_by_file.items()
+    ])
+    return issues
+
+def enrich_issues(issues: List[Issue]) -> List[Issue]:
+    """
+    Enriches issues concurrently, one batched request per file, instead of
+    one blocking API round-trip per issue. Issues carry their code snippet
+    from detection, so no file contents are needed here.
+    """
+    return asyncio.run(_enrich_all(issues))
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Optional, Tuple
 
 from tree_sitter import Tree, Language, Parser
@@ -9,12 +10,21 @@ LANG_MAP = {
     ".js": "javascript",
 }
 
-def parse_file_to_ast(file_path: str) -> Optional[Tuple[Tree, Language]]:
+@lru_cache(maxsize=None)
+def _get_parser(lang_name: str) -> Parser:
+    """Returns a reusable Parser for the language, built once per process."""
+    parser = Parser()
+    parser.set_language(get_language(lang_name))
+    return parser
+
+def parse_file_to_ast(file_path: str, content_bytes: Optional[bytes] = None) -> Optional[Tuple[Tree, Language]]:
     """
-    Reads a file and parses it into a tree-sitter AST Tree.
+    Parses a file into a tree-sitter AST Tree.
 
     Args:
         file_path: The absolute path to the code file.
+        content_bytes: The file's bytes, if the caller already read them;
+            passing them avoids a second read of the same file.
 
     Returns:
         A tuple of (Tree, Language) if parsing is successful, otherwise None.
@@ -25,19 +35,18 @@ def parse_file_to_ast(file_path: str) -> Optional[Tuple[Tree, Language]]:
     if not lang_name:
         return None
 
-    try:
-        with open(file_path, "rb") as f:
-            content_bytes = f.read()
-    except Exception as e:
-        print(f"Error reading file {file_path}: {e}")
-        return None
+    if content_bytes is None:
+        try:
+            with open(file_path, "rb") as f:
+                content_bytes = f.read()
+        except Exception as e:
+            print(f"Error reading file {file_path}: {e}")
+            return None
 
     language = get_language(lang_name)
-    
-    parser = Parser()
-    
-    parser.set_language(language)
+
+    parser = _get_parser(lang_name)
 
     tree = parser.parse(content_bytes)
-    
+
     return tree, language
\ No newline at end of file
@@ -1,21 +1,46 @@
-from pydantic import BaseModel, Field
+from dataclasses import asdict, dataclass
 from typing import Literal, Optional
 
 Severity = Literal["LOW", "MEDIUM", "HIGH", "CRITICAL"]
 
-class Issue(BaseModel):
+# Shared sort order for severities; lower rank sorts first in reports.
+SEVERITY_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+@dataclass
+class Issue:
     """
-    A Pydantic model representing a single code quality issue.
+    A single code quality issue.
+
+    A plain dataclass rather than a Pydantic model: detectors build every
+    field themselves, so per-instance validation was pure overhead on the
+    hot path. (``slots=True`` would shave a little more, but it needs
+    Python 3.10 and we still support 3.9.)
     """
     file_path: str
     line_number: int
     column_number: int
-    code: str = Field(..., description="A short code for the issue type, e.g., 'complexity'")
-    message: str = Field(..., description="A developer-friendly message explaining the issue.")
+    # A short code for the issue type, e.g. 'complexity'.
+    code: str
+    # A developer-friendly message explaining the issue.
+    message: str
     severity: Severity
 
     ai_explanation: Optional[str] = None
     ai_suggestion: Optional[str] = None
 
-    class Config:
-        use_enum_values = True
\ No newline at end of file
+    # Code context around the issue, extracted at detection time.
+    code_snippet: Optional[str] = None
+
+    def dict(self) -> dict:
+        """Plain-dict form, matching the old Pydantic ``.dict()`` shape."""
+        return asdict(self)
+
+    @classmethod
+    def construct(cls, **fields) -> "Issue":
+        """Kept for detector call sites; the constructor is already cheap."""
+        return cls(**fields)
+
+    @property
+    def severity_rank(self) -> int:
+        """Integer sort rank for this issue's severity (CRITICAL first)."""
+        return SEVERITY_ORDER.get(self.severity, 99)
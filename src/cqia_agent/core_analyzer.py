@@ -1,22 +1,169 @@
+import hashlib
+import json
 import os
-from typing import List, Dict, Tuple
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Optional, Tuple
 from rich.progress import track
-from .utils.file_handler import find_code_files
+from .utils.file_handler import find_code_files, read_file_bytes
 from .analysis.ast_parser import parse_file_to_ast
 from .analysis.issue_detector import (
     run_eslint_detector,
     run_bandit_detector,
+    collect_ast_captures,
     detect_complexity_issues,
     detect_missing_documentation,
     detect_hardcoded_secrets,
     detect_performance_issues_with_ai
 )
-from .ai.enricher import enrich_issue
+from .ai.enricher import compute_line_starts, enrich_issues, extract_code_context
 from .analysis.models import Issue
 
-def perform_analysis(path: str = None, files: List[str] = None, no_enrich: bool = False) -> Tuple[List[Issue], Dict[str, bytes]]:
+# Cache of structural (AST-derived) detector outputs, keyed by content hash,
+# in one SQLite store instead of a file per key. WAL mode lets pool workers
+# read and write concurrently. Bump the version whenever detectors change.
+AST_CACHE_DB = os.path.join(os.getcwd(), '.cqia_cache', 'ast_cache.sqlite')
+AST_CACHE_VERSION = 1
+
+_ast_cache_conn: Optional[sqlite3.Connection] = None
+
+def _ast_cache_connection() -> sqlite3.Connection:
+    """One connection per process (workers each open their own)."""
+    global _ast_cache_conn
+    if _ast_cache_conn is None:
+        os.makedirs(os.path.dirname(AST_CACHE_DB), exist_ok=True)
+        conn = sqlite3.connect(AST_CACHE_DB, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ast_cache ("
+            " hash TEXT, lang TEXT, version INTEGER, issues_json TEXT,"
+            " PRIMARY KEY (hash, lang, version))"
+        )
+        _ast_cache_conn = conn
+    return _ast_cache_conn
+
+def _load_ast_cache(content_digest: str, lang_name: str, file_path: str) -> Optional[List[Issue]]:
+    try:
+        row = _ast_cache_connection().execute(
+            "SELECT issues_json FROM ast_cache WHERE hash=? AND lang=? AND version=?",
+            (content_digest, lang_name, AST_CACHE_VERSION),
+        ).fetchone()
+        if row is None:
+            return None
+        entries = json.loads(row[0])
+    except (sqlite3.Error, OSError, json.JSONDecodeError):
+        return None
+    # Issues are a pure function of the content; re-point them at the
+    # current path in case the same content lives somewhere else now.
+    return [Issue(**{**entry, "file_path": file_path}) for entry in entries]
+
+def _store_ast_cache(content_digest: str, lang_name: str, issues: List[Issue]):
+    try:
+        conn = _ast_cache_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO ast_cache (hash, lang, version, issues_json) VALUES (?, ?, ?, ?)",
+            (content_digest, lang_name, AST_CACHE_VERSION, json.dumps([issue.dict() for issue in issues])),
+        )
+        conn.commit()
+    except (sqlite3.Error, OSError):
+        pass  # Best-effort cache; analysis already has its results.
+
+# Manifest of the previous run: per-file content hash plus the issues that
+# were found, so unchanged files skip every detector on the next run.
+# Versioned like the AST cache; bump when the entry or Issue shape changes.
+MANIFEST_PATH = os.path.join(os.getcwd(), '.cqia_cache', 'manifest.json')
+MANIFEST_VERSION = 1
+
+def _load_manifest() -> Dict[str, dict]:
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+def _store_manifest(files: Dict[str, dict]):
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+    except OSError:
+        pass  # Best-effort; the next run simply re-analyzes everything.
+
+def _attach_code_snippets(issues: List[Issue], content: bytes):
+    """Decodes once and attaches the enrichment snippet to each issue."""
+    if not issues:
+        return
+    content_str = content.decode('utf-8', errors='ignore')
+    line_starts = compute_line_starts(content_str)
+    for issue in issues:
+        issue.code_snippet = extract_code_context(content_str, issue.line_number, line_starts=line_starts)
+
+def _analyze_one(file_path: str, manifest_entry: Optional[dict] = None,
+                 no_enrich: bool = False) -> Tuple[bool, List[Issue], Optional[str], bool]:
+    """
+    Runs the in-process detectors on a single file (the bandit/eslint
+    subprocess scanners are batched in the parent).
+    Module-level so it can run in a worker process. Returns
+    (ok, issues, content_digest, from_manifest); the file bytes stay in
+    the worker so the pool does not pickle every file back to the parent.
     """
-    Performs a full analysis on a given path or list of files and returns issues and file contents.
+    try:
+        content = read_file_bytes(file_path)
+    except Exception:
+        return False, [], None, False
+
+    content_digest = hashlib.sha256(content).hexdigest()
+    if (manifest_entry
+            and manifest_entry.get('sha') == content_digest
+            and manifest_entry.get('no_enrich') == no_enrich):
+        # Unchanged since the last run in the same mode: reuse its issues
+        # (snippets and AI fields included) without running any detector.
+        try:
+            cached_issues = [Issue(**entry) for entry in manifest_entry.get('issues', [])]
+        except TypeError:
+            pass  # Entry predates an Issue field change; re-analyze.
+        else:
+            return True, cached_issues, content_digest, True
+
+    issues: List[Issue] = []
+    issues.extend(detect_hardcoded_secrets(file_path, content))
+
+    lang_name = "python" if file_path.endswith('.py') else "javascript"
+    cached_structural = _load_ast_cache(content_digest, lang_name, file_path)
+
+    if cached_structural is not None and no_enrich:
+        # Unchanged content and no AI pass requested: skip tree-sitter entirely.
+        issues.extend(cached_structural)
+    else:
+        parse_result = parse_file_to_ast(file_path, content)
+        if parse_result:
+            tree, language = parse_result
+            captures = collect_ast_captures(tree, language, lang_name)
+
+            if cached_structural is not None:
+                issues.extend(cached_structural)
+            else:
+                structural_issues = list(detect_complexity_issues(captures, file_path, lang_name))
+                structural_issues.extend(detect_missing_documentation(captures, file_path, lang_name))
+                _store_ast_cache(content_digest, lang_name, structural_issues)
+                issues.extend(structural_issues)
+            if not no_enrich:
+                issues.extend(detect_performance_issues_with_ai(captures, file_path, content, lang_name))
+
+    # Decode once per file and attach the snippet each issue needs for
+    # enrichment, so the enrich stage never re-decodes whole files per issue.
+    _attach_code_snippets(issues, content)
+
+    return True, issues, content_digest, False
+
+def perform_analysis(path: str = None, files: List[str] = None, no_enrich: bool = False) -> Tuple[List[Issue], List[str]]:
+    """
+    Performs a full analysis on a given path or list of files and returns
+    the issues and the list of analyzed file paths.
     This is the core logic engine of the agent.
     """
     if files:
@@ -25,40 +172,77 @@ def perform_analysis(path: str = None, files: List[str] = None, no_enrich: bool
         code_files = list(find_code_files(path))
     else:
         # Neither path nor files provided, return empty
-        return [], {}
+        return [], []
 
     if not code_files:
-        return [], {}
+        return [], []
 
+    manifest = _load_manifest()
     all_issues = []
-    file_contents: Dict[str, bytes] = {}
-    for file_path in track(code_files, description="[cyan]Analyzing files...[/cyan]"):
-        try:
-            with open(file_path, "rb") as f:
-                file_contents[file_path] = f.read()
-        except Exception:
-            continue
-        
-        all_issues.extend(run_eslint_detector(file_path))
-        all_issues.extend(run_bandit_detector(file_path))
-        all_issues.extend(detect_hardcoded_secrets(file_path, file_contents[file_path]))
-        
-        parse_result = parse_file_to_ast(file_path)
-        if parse_result:
-            tree, language = parse_result
-            lang_name = "python" if file_path.endswith('.py') else "javascript"
-            
-            all_issues.extend(detect_complexity_issues(tree, language, file_path, file_contents[file_path], lang_name))
-            all_issues.extend(detect_missing_documentation(tree, language, file_path, file_contents[file_path], lang_name))
-            if not no_enrich:
-                all_issues.extend(detect_performance_issues_with_ai(tree, language, file_path, file_contents[file_path], lang_name))
+    analyzed_files: List[str] = []
+    issues_by_file: Dict[str, List[Issue]] = {}
+    digests: Dict[str, str] = {}
+    # AST parsing is CPU-bound and independent per file, so fan the per-file
+    # work out across cores and reassemble results in the parent.
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(
+            partial(_analyze_one, no_enrich=no_enrich),
+            code_files,
+            [manifest.get(file_path) for file_path in code_files],
+            chunksize=8,
+        )
+        fresh_files: List[str] = []
+        for file_path, (ok, issues, content_digest, from_manifest) in track(
+            zip(code_files, results),
+            total=len(code_files),
+            description="[cyan]Analyzing files...[/cyan]",
+        ):
+            if not ok:
+                continue
+            analyzed_files.append(file_path)
+            issues_by_file[file_path] = issues
+            digests[file_path] = content_digest
+            all_issues.extend(issues)
+            if not from_manifest:
+                fresh_files.append(file_path)
+
+    # One bandit run and one eslint run over every changed file, instead of
+    # a subprocess launch per file; manifest hits already carry their
+    # subprocess-detector issues from the previous run.
+    if fresh_files:
+        # The scanners report absolute paths in their JSON output, while
+        # the analysis is keyed by whatever paths the caller passed in
+        # (gh-review uses relative ones); remap before matching.
+        abs_to_input = {os.path.abspath(file_path): file_path for file_path in fresh_files}
+        subprocess_issues_by_file: Dict[str, List[Issue]] = {}
+        for issue in list(run_bandit_detector(fresh_files)) + list(run_eslint_detector(fresh_files)):
+            input_path = abs_to_input.get(os.path.abspath(issue.file_path))
+            if input_path is not None:
+                issue.file_path = input_path
+                subprocess_issues_by_file.setdefault(input_path, []).append(issue)
+        for file_path, file_issues in subprocess_issues_by_file.items():
+            # Only the few files with scanner hits are re-read here, so the
+            # pool never ships whole file contents back to the parent.
+            try:
+                content = read_file_bytes(file_path)
+            except Exception:
+                content = b''
+            _attach_code_snippets(file_issues, content)
+            issues_by_file[file_path].extend(file_issues)
+            all_issues.extend(file_issues)
 
     if not no_enrich and all_issues:
         print(f"\nEnriching {len(all_issues)} issue(s) with AI... (this may take a moment)")
-        enriched_issues = [
-            enrich_issue(issue, file_contents[issue.file_path].decode('utf-8', errors='ignore'))
-            for issue in all_issues
-        ]
-        all_issues = enriched_issues
-        
-    return all_issues, file_contents
\ No newline at end of file
+        all_issues = enrich_issues(all_issues)
+
+    # Record this run (post-enrichment, so reused issues keep their AI fields).
+    _store_manifest({
+        file_path: {
+            "sha": digests[file_path],
+            "no_enrich": no_enrich,
+            "issues": [issue.dict() for issue in issues_by_file[file_path]],
+        }
+        for file_path in issues_by_file
+    })
+
+    return all_issues, analyzed_files
\ No newline at end of file
@@ -1,22 +1,42 @@
+import operator
 import os
-import re
+from functools import lru_cache
 from typing import List, Dict, Set
 from github import Github, GithubException
 from git import Repo, GitCommandError
 from ..analysis.models import Issue
 
+@lru_cache(maxsize=1)
+def get_github_client(token: str) -> Github:
+    """
+    One Github client (and therefore one pooled HTTP session) per process,
+    so successive API calls reuse the TCP/TLS connection. per_page=100
+    keeps get_files() pagination to a minimum.
+    """
+    return Github(token, per_page=100, pool_size=20)
+
 def get_changed_files_from_diff(repo_path: str, base_sha: str, head_sha: str) -> List[str]:
     """Uses GitPython to get a list of changed files between two commits."""
     try:
         repo = Repo(repo_path)
-        diff_output = repo.git.diff(f"{base_sha}...{head_sha}", name_status=True)
+        # -z output is NUL-delimited: "status\0path\0" per entry, with a
+        # second path for renames/copies ("R100\0old\0new\0"). Unlike the
+        # tab-split text form this parses paths with tabs or newlines and
+        # does not crash on rename entries.
+        diff_output = repo.git.diff(f"{base_sha}...{head_sha}", name_status=True, z=True)
+        tokens = diff_output.split('\x00')
         changed_files = []
-        for line in diff_output.splitlines():
-            if '\t' in line:
-                status, file_path = line.split('\t')
-                if status in ['A', 'M']:
-                    full_path = os.path.join(repo.working_dir, file_path)
-                    changed_files.append(full_path)
+        index = 0
+        while index < len(tokens) - 1:
+            status = tokens[index]
+            if status[:1] in ('R', 'C'):
+                file_path = tokens[index + 2]
+                index += 3
+            else:
+                file_path = tokens[index + 1]
+                index += 2
+            if status[:1] in ('A', 'M', 'R'):
+                changed_files.append(os.path.join(repo.working_dir, file_path))
         return changed_files
     except GitCommandError as e:
         print(f"Error running git diff: {e}")
@@ -32,19 +52,26 @@ def get_changed_lines_from_pr(pr) -> Dict[str, Set[int]]:
     changed_lines = {}
     diff_files = pr.get_files()
     for file in diff_files:
-        changed_lines[file.filename] = set()
+        file_lines = changed_lines[file.filename] = set()
         if not file.patch:
             continue
         current_line_in_file = 0
-        for line in file.patch.split('\n'):
-            if line.startswith('@@'):
-                match = re.search(r'\+([0-9]+)', line)
-                if match:
-                    current_line_in_file = int(match.group(1))
-            elif line.startswith('+') and not line.startswith('+++'):
-                changed_lines[file.filename].add(current_line_in_file)
-                current_line_in_file += 1
-            elif not line.startswith('-'):
+        # Dispatch on the first character; each patch line starts with
+        # '@' (hunk header), '+', '-' or ' ', so no regex is needed.
+        for line in file.patch.splitlines():
+            first = line[:1]
+            if first == '@':
+                # Hunk header "@@ -a,b +c,d @@": the new-side start line
+                # is the third space-separated field, minus its '+'.
+                try:
+                    current_line_in_file = int(line.split(' ', 3)[2].split(',')[0][1:])
+                except (IndexError, ValueError):
+                    pass
+            elif first == '+':
+                if line[:3] != '+++':
+                    file_lines.add(current_line_in_file)
+                    current_line_in_file += 1
+            elif first != '-':
                 current_line_in_file += 1
     return changed_lines
 
@@ -56,20 +83,25 @@ def format_issues_for_pr_comment(issues: List[Issue]) -> str:
     if not issues:
         return "✅ **CQIA Analysis Complete**\n\nNo new issues found on the changed lines. Great job!"
 
-    severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
-    sorted_issues = sorted(issues, key=lambda i: (severity_order.get(i.severity, 99), i.file_path, i.line_number))
+    sorted_issues = sorted(issues, key=operator.attrgetter('severity_rank', 'file_path', 'line_number'))
 
-    summary = f"### 🤖 CQIA Analysis Report: Found {len(sorted_issues)} issue(s)\n\n"
-    summary += "| Severity | File | Line | Message |\n"
-    summary += "|:---|:---|:---|:---|\n"
-    
+    # Collect rows and join once; += concatenation re-copies the whole
+    # summary per issue. Basenames are memoized since issues cluster by file.
+    parts = [
+        f"### 🤖 CQIA Analysis Report: Found {len(sorted_issues)} issue(s)\n\n",
+        "| Severity | File | Line | Message |\n",
+        "|:---|:---|:---|:---|\n",
+    ]
+    basenames: Dict[str, str] = {}
     for issue in sorted_issues:
-        file_path = os.path.basename(issue.file_path) 
+        file_path = basenames.get(issue.file_path)
+        if file_path is None:
+            file_path = basenames[issue.file_path] = os.path.basename(issue.file_path)
         message = issue.message.split('\n')[0]
-        summary += f"| `{issue.severity}` | `{file_path}` | {issue.line_number} | {message} |\n"
-        
-    summary += "\n---\n*This comment was generated automatically by the Code Quality Intelligence Agent.*"
-    return summary
+        parts.append(f"| `{issue.severity}` | `{file_path}` | {issue.line_number} | {message} |\n")
+
+    parts.append("\n---\n*This comment was generated automatically by the Code Quality Intelligence Agent.*")
+    return ''.join(parts)
 
 def post_pr_comment(repo_name: str, pr_number: int, issues: List[Issue]):
     """
@@ -81,7 +113,7 @@ def post_pr_comment(repo_name: str, pr_number: int, issues: List[Issue]):
         return
 
     try:
-        g = Github(token)
+        g = get_github_client(token)
         repo = g.get_repo(repo_name)
         pr = repo.get_pull(pr_number)
 
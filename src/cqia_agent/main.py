@@ -1,21 +1,14 @@
 import click
+import operator
 import os
 from dotenv import load_dotenv
 from rich.console import Console
-from rich.markdown import Markdown
-import warnings 
+import warnings
 from cqia_agent.utils.file_handler import find_code_files
-from cqia_agent.core_analyzer import perform_analysis
-from cqia_agent.reporting.visualizer import generate_severity_chart
-from cqia_agent.qa.indexer import create_vector_store, DB_PATH
-from cqia_agent.qa.retriever import create_rag_chain
-from .integrations.github_pr import get_changed_files_from_diff, get_changed_lines_from_pr, post_pr_comment
-from github import Github
-from .reporting.html_generator import generate_html_report 
-from cqia_agent.qa.agent import create_agent_graph
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from cqia_agent.reporting.display import display_ai_response
+
+# Heavy dependencies (LangChain, FAISS, torch, matplotlib, PyGithub, ...)
+# are imported inside the commands that need them, so e.g. a plain
+# `cqia analyze --no-enrich` does not pay their multi-second import cost.
 
 
 @click.group()
@@ -31,18 +24,20 @@ def cli():
 @click.option('--html', type=click.Path(dir_okay=False), help="Generate an HTML report at the specified path.")
 def analyze(path, no_enrich, chart, html):
     """Analyzes the code repository at the given path."""
+    from rich.markdown import Markdown
+    from cqia_agent.core_analyzer import perform_analysis
+
     console = Console()
 
     console.print(f"🚀 Starting analysis of '{path}'...", style="bold green")
 
-    all_issues, file_contents = perform_analysis(path, no_enrich)
+    all_issues, analyzed_files = perform_analysis(path, no_enrich=no_enrich)
 
-    if not file_contents:
+    if not analyzed_files:
         console.print("No supported code files (.py, .js) found.", style="yellow")
         return
 
-    code_files = list(file_contents.keys())
-    console.print(f"Found {len(code_files)} code file(s) to analyze.")
+    console.print(f"Found {len(analyzed_files)} code file(s) to analyze.")
 
     console.print("\n[bold magenta]3. Analysis Report:[/bold magenta]")
 
@@ -50,33 +45,37 @@ def analyze(path, no_enrich, chart, html):
     if not all_issues:
         console.print("✅ No issues found. Great job!", style="bold green")
     else:
-        severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
-        sorted_issues = sorted(all_issues, key=lambda i: (severity_order.get(i.severity, 99), i.file_path))
+        sorted_issues = sorted(all_issues, key=operator.attrgetter('severity_rank', 'file_path'))
         report_summary_str += f"Found {len(all_issues)} issue(s):\n"
         console.print(f"Found {len(all_issues)} issue(s):", style="bold yellow")
+        report_md_parts = []
         for issue in sorted_issues:
-            color = {"CRITICAL": "red", "HIGH": "yellow", "MEDIUM": "cyan"}.get(issue.severity, "white")
-            
             report_md = f"\n---\n"
             report_md += f"### [{issue.severity}] - `{issue.file_path}:{issue.line_number}`\n"
             report_md += f"> {issue.message}\n\n"
-            
+
             if issue.ai_explanation:
                 report_md += f"**AI Explanation:**\n{issue.ai_explanation}\n\n"
             if issue.ai_suggestion:
                 report_md += f"**AI Suggestion:**\n{issue.ai_suggestion}\n"
 
-            console.print(Markdown(report_md, style=color))
-            report_summary_str += report_md 
+            report_md_parts.append(report_md)
+
+        # One Markdown parse and one terminal flush for the whole report,
+        # instead of re-rendering and writing out per issue.
+        full_report_md = "".join(report_md_parts)
+        report_summary_str += full_report_md
+        console.print(Markdown(full_report_md))
 
     if chart and all_issues:
+        from cqia_agent.reporting.visualizer import generate_severity_chart
         output_dir = os.path.join(os.getcwd(), "cqia_reports")
         chart_path = generate_severity_chart(all_issues, output_dir)
         if chart_path:
             console.print(f"\n📊 Severity distribution chart saved to: {chart_path}", style="bold blue")
     
     if html:
-        from .utils.file_handler import find_code_files
+        from .reporting.html_generator import generate_html_report
         file_count = len(list(find_code_files(path)))
         generate_html_report(all_issues, file_count, chart_path, html)
 
@@ -88,6 +87,11 @@ def analyze(path, no_enrich, chart, html):
 @click.argument('path', type=click.Path(exists=True, file_okay=True, dir_okay=True, resolve_path=True))
 def ask(path):
     """Starts an interactive Q&A session about the codebase."""
+    from langchain_community.vectorstores import FAISS
+    from cqia_agent.qa.indexer import create_vector_store, get_embedder, DB_PATH
+    from cqia_agent.qa.agent import create_agent_graph
+    from cqia_agent.reporting.display import display_ai_response
+
     console = Console()
     code_files = list(find_code_files(path))
     console.print("Performing RAG Ingestion", style="blue")
@@ -98,7 +102,7 @@ def ask(path):
 
     try:
         console.print("Loading knowledge base...", style="cyan")
-        embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        embeddings = get_embedder()
         db = FAISS.load_local(DB_PATH, embeddings, allow_dangerous_deserialization=True)
         retriever = db.as_retriever()
         
@@ -127,6 +131,14 @@ def ask(path):
 @click.option('--head', 'head_sha', required=True, help="The head commit SHA of the PR.")
 def github_review(repo_name, pr_number, local_path, base_sha, head_sha):
     """Analyzes a GitHub PR diff and posts a summary comment."""
+    from cqia_agent.core_analyzer import perform_analysis
+    from .integrations.github_pr import (
+        get_changed_files_from_diff,
+        get_changed_lines_from_pr,
+        get_github_client,
+        post_pr_comment,
+    )
+
     console = Console()
     console.print(f"🚀 Starting GitHub PR analysis for {repo_name} #{pr_number}...", style="bold green")
     
@@ -145,15 +157,22 @@ def github_review(repo_name, pr_number, local_path, base_sha, head_sha):
     all_issues, _ = perform_analysis(local_path, no_enrich=False)
 
     console.print("Fetching changed line numbers from GitHub PR...")
-    g = Github(token)
+    g = get_github_client(token)
     repo = g.get_repo(repo_name)
     pr = repo.get_pull(pr_number)
     changed_lines = get_changed_lines_from_pr(pr)
 
+    # Flatten to (path, line) pairs for one-hash membership tests, and
+    # memoize relpath so files with many issues normalize their path once.
+    changed_pairs = {(path, line) for path, lines in changed_lines.items() for line in lines}
+    rel_cache = {}
     issues_in_pr_diff = []
     for issue in all_issues:
-        relative_path = os.path.relpath(issue.file_path, start=local_path).replace('\\', '/')
-        if relative_path in changed_lines and issue.line_number in changed_lines[relative_path]:
+        relative_path = rel_cache.get(issue.file_path)
+        if relative_path is None:
+            relative_path = os.path.relpath(issue.file_path, start=local_path).replace('\\', '/')
+            rel_cache[issue.file_path] = relative_path
+        if (relative_path, issue.line_number) in changed_pairs:
             issues_in_pr_diff.append(issue)
 
     post_pr_comment(repo_name, pr_number, issues_in_pr_diff)
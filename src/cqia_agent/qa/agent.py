@@ -1,4 +1,5 @@
-from typing import List, TypedDict, Annotated
+from functools import lru_cache
+from typing import Dict, List, TypedDict, Annotated
 import operator
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
@@ -32,31 +33,43 @@ class AgentState(TypedDict):
     generation: str
 
 
+# The chains are pure pipeline objects, so build each once per process
+# instead of re-parsing the template on every Q&A turn. Lazy (not at
+# import) because get_llm needs the API key from the environment.
+@lru_cache(maxsize=1)
+def _decompose_chain():
+    return ChatPromptTemplate.from_template(DECOMPOSE_PROMPT_TEMPLATE) | get_llm() | JsonOutputParser()
+
+@lru_cache(maxsize=1)
+def _synthesize_chain():
+    return ChatPromptTemplate.from_template(SYNTHESIZE_PROMPT_TEMPLATE) | get_llm() | StrOutputParser()
+
 def decompose_question_node(state):
     print("---AGENT STEP: DECOMPOSING QUESTION---")
     question = state["question"]
-    prompt = ChatPromptTemplate.from_template(DECOMPOSE_PROMPT_TEMPLATE)
-    llm = get_llm()
-    chain = prompt | llm | JsonOutputParser()
-    result = chain.invoke({"question": question})
+    result = _decompose_chain().invoke({"question": question})
     return {"sub_questions": result['sub_questions'], "documents": []}
 
-def retrieve_docs_node(state, retriever):
+def retrieve_docs_node(state, retriever, retrieval_cache: Dict[str, list]):
     print("---AGENT STEP: RETRIEVING DOCUMENTS---")
-    sub_question = state["sub_questions"][0]
-    remaining_questions = state["sub_questions"][1:]
-    documents = retriever.invoke(sub_question)
-    return {"documents": documents, "sub_questions": remaining_questions}
+    # Each sub-question's retrieval is independent, so fetch them all in
+    # one batch call (Runnable.batch fans out over a thread pool) instead
+    # of looping through the graph once per sub-question.
+    sub_questions = state["sub_questions"]
+    keys = [question.strip().lower() for question in sub_questions]
+    pending = [q for q, key in zip(sub_questions, keys) if key not in retrieval_cache]
+    if pending:
+        for question, docs in zip(pending, retriever.batch(pending)):
+            retrieval_cache[question.strip().lower()] = docs
+    documents = [doc for key in keys for doc in retrieval_cache[key]]
+    return {"documents": documents, "sub_questions": []}
 
 def synthesize_answer_node(state):
     print("---AGENT STEP: SYNTHESIZING FINAL ANSWER---")
     question = state["question"]
     documents = state["documents"]
     context_str = "\n\n".join([doc.page_content for doc in documents])
-    prompt = ChatPromptTemplate.from_template(SYNTHESIZE_PROMPT_TEMPLATE)
-    llm = get_llm()
-    chain = prompt | llm | StrOutputParser()
-    generation = chain.invoke({"context": context_str, "question": question})
+    generation = _synthesize_chain().invoke({"context": context_str, "question": question})
     return {"generation": generation}
 
 def router_node(state):
@@ -67,9 +80,16 @@ def router_node(state):
         return "synthesize"
 
 def create_agent_graph(retriever):
+    # Retrieval results per normalized sub-question. Multi-turn sessions
+    # decompose related questions into overlapping sub-questions, so
+    # repeats skip the search. Scoped to this graph's retriever: a graph
+    # built over a rebuilt index starts with an empty cache instead of
+    # serving documents from the old one.
+    retrieval_cache: Dict[str, list] = {}
+
     workflow = StateGraph(AgentState)
     workflow.add_node("decompose", decompose_question_node)
-    workflow.add_node("retrieve", lambda state: retrieve_docs_node(state, retriever))
+    workflow.add_node("retrieve", lambda state: retrieve_docs_node(state, retriever, retrieval_cache))
     workflow.add_node("synthesize", synthesize_answer_node)
     workflow.set_entry_point("decompose")
     workflow.add_conditional_edges(
@@ -80,14 +100,9 @@ def create_agent_graph(retriever):
             "synthesize": "synthesize"
         }
     )
-    workflow.add_conditional_edges(
-        "retrieve",
-        router_node,
-        {
-            "retrieve": "retrieve",
-            "synthesize": "synthesize"
-        }
-    )
+    # One batched retrieval handles every sub-question, so the graph no
+    # longer cycles through the router per question.
+    workflow.add_edge("retrieve", "synthesize")
     workflow.add_edge("synthesize", END)
     agent = workflow.compile()
     print("Multi-context agent graph compiled successfully.")
@@ -1,12 +1,30 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict
 from rich.progress import track
-from langchain.text_splitter import CharacterTextSplitter
+from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import TextLoader
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
 DB_PATH = os.path.join(os.getcwd(), 'vector_db_store')
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+@lru_cache(maxsize=1)
+def get_embedder() -> HuggingFaceEmbeddings:
+    """
+    Loads the sentence-transformer model once per process. The cold start
+    is multi-second, so indexing and Q&A share this singleton.
+
+    Indexing a repo embeds thousands of chunks, so encode in larger
+    batches than sentence-transformers' default of 32 to amortize the
+    per-batch Python and PyTorch overhead.
+    """
+    return HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL_NAME,
+        encode_kwargs={"batch_size": 64},
+    )
 
 def create_vector_store(file_paths: List[str], issues_summary: str):
     """
@@ -18,13 +36,21 @@ def create_vector_store(file_paths: List[str], issues_summary: str):
     """
     print("Creating vector store for Q&A...")
     
-    documents = []
-    for file_path in track(file_paths, description="[cyan]Ingesting files...[/cyan]"):
+    def _load_one(file_path: str):
         try:
-            loader = TextLoader(file_path, encoding='utf-8')
-            documents.extend(loader.load())
+            return TextLoader(file_path, encoding='utf-8').load()
         except Exception as e:
             print(f"Warning: Could not load file {file_path}. Skipping. Error: {e}")
+            return []
+
+    # Loading is disk-bound, so read files on a thread pool instead of
+    # one at a time; results come back in input order.
+    documents = []
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4)) as executor:
+        for loaded in track(executor.map(_load_one, file_paths),
+                            total=len(file_paths),
+                            description="[cyan]Ingesting files...[/cyan]"):
+            documents.extend(loaded)
             
     if issues_summary:
         from langchain_core.documents import Document
@@ -35,11 +61,22 @@ def create_vector_store(file_paths: List[str], issues_summary: str):
         print("No documents were loaded to create the vector store.")
         return
 
-    text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-    docs = text_splitter.split_documents(documents)
+    # Split along language-aware separators (def/class boundaries etc.)
+    # so chunks follow code structure: fewer broken chunks means fewer
+    # embeddings to compute and better retrieval.
+    splitters = {
+        '.py': RecursiveCharacterTextSplitter.from_language(Language.PYTHON, chunk_size=1000, chunk_overlap=100),
+        '.js': RecursiveCharacterTextSplitter.from_language(Language.JS, chunk_size=1000, chunk_overlap=100),
+    }
+    default_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+    docs = []
+    for document in documents:
+        extension = os.path.splitext(document.metadata.get('source', ''))[1]
+        splitter = splitters.get(extension, default_splitter)
+        docs.extend(splitter.split_documents([document]))
     
     print("Loading embedding model (may download on first run)...")
-    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    embeddings = get_embedder()
     
     print(f"Creating and saving vector store at: {DB_PATH}")
     db = FAISS.from_documents(docs, embeddings)
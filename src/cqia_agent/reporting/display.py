@@ -3,15 +3,20 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 
+# Compiled once; display_ai_response runs on every Q&A turn.
+_TITLE_RE = re.compile(r"\[TITLE\]:(.*?)\n", re.DOTALL)
+_SUMMARY_RE = re.compile(r"\[SUMMARY\]:(.*?)\n", re.DOTALL)
+_RESPONSE_RE = re.compile(r"\[RESPONSE\]:(.*)", re.DOTALL)
+
 def display_ai_response(response: str):
     """
     Parses a structured AI response and prints it to the console as a formatted panel.
     """
     console = Console()
 
-    title_match = re.search(r"\[TITLE\]:(.*?)\n", response, re.DOTALL)
-    summary_match = re.search(r"\[SUMMARY\]:(.*?)\n", response, re.DOTALL)
-    response_match = re.search(r"\[RESPONSE\]:(.*)", response, re.DOTALL)
+    title_match = _TITLE_RE.search(response)
+    summary_match = _SUMMARY_RE.search(response)
+    response_match = _RESPONSE_RE.search(response)
 
     title = title_match.group(1).strip() if title_match else "AI Response"
     summary = summary_match.group(1).strip() if summary_match else ""
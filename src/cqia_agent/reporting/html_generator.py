@@ -1,5 +1,6 @@
 import os
 import base64
+import operator
 from datetime import datetime
 from typing import List, Optional
 from jinja2 import Environment, FileSystemLoader
@@ -21,7 +22,7 @@ def generate_html_report(issues: List[Issue], file_count: int, chart_path: Optio
 
     # Prepare data for the template
     template_data = {
-        "issues": sorted(issues, key=lambda i: ({"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}.get(i.severity, 99), i.file_path)),
+        "issues": sorted(issues, key=operator.attrgetter('severity_rank', 'file_path')),
         "file_count": file_count,
         "chart_path": chart_path,
         "chart_data": chart_data,
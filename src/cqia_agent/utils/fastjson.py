@@ -0,0 +1,18 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """
+    Parses JSON with orjson when it is installed (a SIMD-accelerated C
+    parser, typically 3-5x faster than stdlib json), falling back to the
+    standard library otherwise. Accepts str or bytes.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)